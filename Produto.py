@@ -1,61 +1,15 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import requests
 import os
 import time
+from dados import carregar_dataset
+from exportar import exibir_exportacao
 
 
-# Função para carregar dados com cache (agora vai buscar do endpoint)
-@st.cache_data(ttl=300)
-def carregar_dados():
-    url = "http://127.0.0.1:5000/dados_vwsomelier?data_inicial=2023-01-01&data_final=2025-12-31&pagina=1&limite=50000000"  # Alterar para o seu endpoint real
-
-    params = {
-        'data_inicial': '2023-01-01', 
-        'data_final': '2025-12-31',    
-        'pagina': 1,                   
-        'limite': 50000000                 
-    }
-
-    try:
-        response = requests.get(url, params=params)
-
-        if response.status_code == 200:
-            df = pd.DataFrame(response.json())  # Convertendo a resposta para um DataFrame
-        else:
-            st.error(f"Erro ao obter dados: {response.status_code}")
-            return pd.DataFrame()
-
-        expected_columns = ['DESCRICAO', 'CODPROD', 'DATA', 'QT', 'PVENDA', 'VLCUSTOFIN']
-        missing_columns = [col for col in expected_columns if col not in df.columns]
-
-        if missing_columns:
-            st.error(f"As seguintes colunas estão faltando: {', '.join(missing_columns)}")
-            return pd.DataFrame()
-
-        df['DESCRICAO'] = df['DESCRICAO'].fillna('').astype(str).str.strip()
-        df['CÓDIGO PRODUTO'] = df['CODPROD'].fillna('').astype(str).str.strip()
-
-        df['Data do Pedido'] = pd.to_datetime(df['DATA'], errors='coerce')
-
-        if df['Data do Pedido'].isnull().any():
-            st.warning("Existem valores inválidos ou ausentes na coluna 'DATA' após conversão para datetime.")
-
-        df['VALOR TOTAL VENDIDO'] =  df['PVENDA']
-        df['Margem de Lucro'] = (df['PVENDA'] - df['VLCUSTOFIN']) 
-        df['Ano'] = df['Data do Pedido'].dt.year
-        df['Mês'] = df['Data do Pedido'].dt.month
-        return df
-
-    except requests.exceptions.RequestException as e:
-        st.error(f"Erro ao fazer a requisição: {e}")
-        return pd.DataFrame()
-
-# Função para exibir a tabela
-# Função para exibir a tabela
-def exibir_tabela(df_filtrado):
-    df_resumo = df_filtrado.groupby(['CÓDIGO PRODUTO', 'DESCRICAO']).agg(
+# Função para resumir as vendas por produto (valores numéricos, sem formatação)
+def resumir_produtos(df):
+    df_resumo = df.groupby(['CÓDIGO PRODUTO', 'DESCRICAO']).agg(
         Total_Vendido=('QT', 'sum'),
         Valor_Total_Vendido=('VALOR TOTAL VENDIDO', 'sum')
     ).reset_index()
@@ -65,13 +19,69 @@ def exibir_tabela(df_filtrado):
         'Valor_Total_Vendido': 'VALOR TOTAL VENDIDO',
         'Total_Vendido': 'QUANTIDADE'
     }, inplace=True)
+    return df_resumo
 
-    # Aplicando formatação nos valores
+# Função para formatar os valores do resumo para exibição
+def formatar_resumo(df_resumo):
     df_resumo['VALOR TOTAL VENDIDO'] = df_resumo['VALOR TOTAL VENDIDO'].apply(lambda x: f"R$ {x:,.2f}".replace(',','.'))
     df_resumo['QUANTIDADE'] = df_resumo['QUANTIDADE'].apply(lambda x: f"{x:,.0f}".replace(',','.'))
-    
+    return df_resumo
+
+# Função para exibir a tabela
+def exibir_tabela(df_filtrado, assinatura):
+    df_resumo = resumir_produtos(df_filtrado)
+
+    # Exportação dos dados numéricos, antes da formatação para exibição
+    exibir_exportacao({
+        'Resumo': df_resumo,
+        'Linhas filtradas': df_filtrado
+    }, 'vendas_produto', 'exportar_tabela', assinatura)
+
     # Exibindo a tabela com as novas colunas formatadas
-    st.dataframe(df_resumo, use_container_width=True)
+    st.dataframe(formatar_resumo(df_resumo), use_container_width=True)
+
+# Resumo do período e da pesquisa em cache, compartilhado entre sessões (somente leitura).
+# `versao` identifica a carga dos dados, para que o resumo expire junto com o dataset;
+# as linhas são filtradas como no modo completo, então os dois modos mostram os mesmos produtos.
+@st.cache_resource(ttl=300, max_entries=20, show_spinner=False)
+def resumo_periodo(_df, versao, periodo_inicial, periodo_final, produto_pesquisa):
+    return resumir_produtos(filtrar_linhas(_df, periodo_inicial, periodo_final, produto_pesquisa))
+
+# Resumo já filtrado e ordenado em cache: a paginação passa a ser apenas um fatiamento
+@st.cache_resource(ttl=300, max_entries=40, show_spinner=False)
+def resumo_ordenado(_df, versao, periodo_inicial, periodo_final, produto_pesquisa, coluna, crescente):
+    df_resumo = resumo_periodo(_df, versao, periodo_inicial, periodo_final, produto_pesquisa)
+    return df_resumo.sort_values(coluna, ascending=crescente, kind='stable', ignore_index=True)
+
+# Função para exibir a tabela paginada: ordena e pagina no servidor e envia só a página visível
+def exibir_tabela_paginada(df, periodo_inicial, periodo_final, produto_pesquisa):
+    col_ordem, col_direcao, col_tamanho = st.columns(3)
+    with col_ordem:
+        coluna = st.selectbox('Ordenar por', ['VALOR TOTAL VENDIDO', 'QUANTIDADE', 'DESCRICAO', 'CÓDIGO PRODUTO'],
+                              key='tabela_ordem')
+    with col_direcao:
+        crescente = st.radio('Ordem', ['Decrescente', 'Crescente'], horizontal=True,
+                             key='tabela_direcao') == 'Crescente'
+    with col_tamanho:
+        linhas_por_pagina = st.selectbox('Linhas por página', [25, 50, 100, 250], index=1, key='tabela_linhas')
+
+    df_resumo = resumo_ordenado(df, df.attrs.get('versao'), periodo_inicial, periodo_final,
+                                produto_pesquisa, coluna, crescente)
+
+    exibir_exportacao({
+        'Resumo': df_resumo,
+        'Linhas filtradas': lambda: filtrar_linhas(df, periodo_inicial, periodo_final, produto_pesquisa)
+    }, 'vendas_produto', 'exportar_tabela', (periodo_inicial, periodo_final, produto_pesquisa))
+
+    total_paginas = max(1, -(-len(df_resumo) // linhas_por_pagina))
+    pagina = st.number_input(f'Página (de {total_paginas})', min_value=1, max_value=total_paginas, value=1, step=1)
+    inicio = (min(pagina, total_paginas) - 1) * linhas_por_pagina
+    df_pagina = formatar_resumo(df_resumo.iloc[inicio:inicio + linhas_por_pagina].copy())
+
+    st.caption(f"{len(df_resumo):,} produtos".replace(',', '.') +
+               f" · Quantidade total: {df_resumo['QUANTIDADE'].sum():,.0f}".replace(',', '.') +
+               f" · Valor total vendido: R$ {df_resumo['VALOR TOTAL VENDIDO'].sum():,.2f}".replace(',', '.'))
+    st.dataframe(df_pagina, use_container_width=True, hide_index=True)
 
 
    
@@ -173,61 +183,90 @@ def exibir_grafico_margem_por_produto(df, periodo_inicial, periodo_final):
 
     st.plotly_chart(fig, key="margem_por_produto")
 
-# Função principal
-def main():
-    st.title("Desempenho de Vendas por Produto")
-
-
-    df = carregar_dados()
-
-    if df.empty:
-        return
-
-    st.markdown("""<style> .stTextInput>div>div>input { border: 2px solid #4CAF50; border-radius: 10px; padding: 10px; font-size: 16px; background-color: black; } </style>""", unsafe_allow_html=True)
+# Função para filtrar as linhas pelo período e pela pesquisa
+def filtrar_linhas(df, periodo_inicial, periodo_final, produto_pesquisa):
+    df_filtrado = df[(df['Data do Pedido'] >= pd.to_datetime(periodo_inicial)) &
+                     (df['Data do Pedido'] <= pd.to_datetime(periodo_final))]
+
+    if produto_pesquisa:
+        produto_pesquisa = ' '.join(produto_pesquisa.split())
+        df_filtrado['DESCRICAO'] = df_filtrado['DESCRICAO'].apply(lambda x: ' '.join(str(x).split()))
+        df_filtrado['CÓDIGO PRODUTO'] = df_filtrado['CÓDIGO PRODUTO'].apply(lambda x: ' '.join(str(x).split()))
+        df_filtrado = df_filtrado[
+            df_filtrado['DESCRICAO'].str.contains(produto_pesquisa, case=False) |
+            df_filtrado['CÓDIGO PRODUTO'].apply(lambda x: x.strip() == produto_pesquisa.strip())
+        ]
+    return df_filtrado
+
+# Seção da tabela de resumo: pesquisa e período próprios, reexecutada isoladamente
+@st.fragment
+def secao_tabela(df):
     produto_pesquisa = st.text_input('🔍 Pesquise por um produto ou código', '', key='search_input')
 
-    # Filtro de período para a Tabela
-    if 'Data do Pedido' in df.columns:
-        with st.container():
-            st.subheader("Tabela de Resumo")
-            periodo_inicio_tabela = st.date_input('Data de Início - Tabela', df['Data do Pedido'].min())
-            periodo_fim_tabela = st.date_input('Data de Fim - Tabela', df['Data do Pedido'].max())
-        
-        df_filtrado = df[(df['Data do Pedido'] >= pd.to_datetime(periodo_inicio_tabela)) & 
-                         (df['Data do Pedido'] <= pd.to_datetime(periodo_fim_tabela))]
-
-        if produto_pesquisa:
-            produto_pesquisa = ' '.join(produto_pesquisa.split())
-            df_filtrado['DESCRICAO'] = df_filtrado['DESCRICAO'].apply(lambda x: ' '.join(str(x).split()))
-            df_filtrado['CÓDIGO PRODUTO'] = df_filtrado['CÓDIGO PRODUTO'].apply(lambda x: ' '.join(str(x).split()))
-            df_filtrado = df_filtrado[
-                df_filtrado['DESCRICAO'].str.contains(produto_pesquisa, case=False) |
-                df_filtrado['CÓDIGO PRODUTO'].apply(lambda x: x.strip() == produto_pesquisa.strip())
-            ]
-
-        exibir_tabela(df_filtrado)
-
-    # Gráfico de Top Produtos
+    with st.container():
+        st.subheader("Tabela de Resumo")
+        periodo_inicio_tabela = st.date_input('Data de Início - Tabela', df['Data do Pedido'].min())
+        periodo_fim_tabela = st.date_input('Data de Fim - Tabela', df['Data do Pedido'].max())
+        tabela_paginada = st.toggle('Tabela paginada', value=True, key='tabela_paginada')
+
+    if tabela_paginada:
+        exibir_tabela_paginada(df, periodo_inicio_tabela, periodo_fim_tabela, produto_pesquisa)
+    else:
+        df_filtrado = filtrar_linhas(df, periodo_inicio_tabela, periodo_fim_tabela, produto_pesquisa)
+        exibir_tabela(df_filtrado, (periodo_inicio_tabela, periodo_fim_tabela, produto_pesquisa))
+
+# Seção do gráfico de Top Produtos
+@st.fragment
+def secao_top_produtos(df):
     with st.container():
         st.subheader("Top Produtos Mais Vendidos por Valor")
         periodo_inicio_produtos = st.date_input('Data de Início - Top Produtos', df['Data do Pedido'].min())
         periodo_fim_produtos = st.date_input('Data de Fim - Top Produtos', df['Data do Pedido'].max())
         exibir_grafico_top_produtos(df, periodo_inicio_produtos, periodo_fim_produtos)
 
-    # Gráfico de Vendas ao Longo do Tempo
+# Seção do gráfico de Vendas ao Longo do Tempo
+@st.fragment
+def secao_vendas_por_tempo(df):
     with st.container():
         st.subheader("Evolução das Vendas")
         periodo_inicio_vendas = st.date_input('Data de Início - Vendas ao Longo do Tempo', df['Data do Pedido'].min())
         periodo_fim_vendas = st.date_input('Data de Fim - Vendas ao Longo do Tempo', df['Data do Pedido'].max())
         exibir_grafico_vendas_por_tempo(df, periodo_inicio_vendas, periodo_fim_vendas)
 
-    # Gráfico de Margem de Lucro por Produto
+# Seção do gráfico de Margem de Lucro por Produto
+@st.fragment
+def secao_margem(df):
     with st.container():
         st.subheader("Margem de Lucro por Produto")
         periodo_inicio_margem = st.date_input('Data de Início - Margem de Lucro', df['Data do Pedido'].min())
         periodo_fim_margem = st.date_input('Data de Fim - Margem de Lucro', df['Data do Pedido'].max())
         exibir_grafico_margem_por_produto(df, periodo_inicio_margem, periodo_fim_margem)
 
+# Função principal
+# Cada seção é um fragmento: alterar um filtro reexecuta apenas a sua seção,
+# sem recarregar os dados, reinjetar o CSS ou redesenhar as outras seções.
+def main():
+    st.title("Desempenho de Vendas por Produto")
+
+
+    df = carregar_dataset("vendas_produto")
+
+    if df.empty:
+        return
+
+    if df['Data do Pedido'].isnull().any():
+        st.warning("Existem valores inválidos ou ausentes na coluna 'DATA' após conversão para datetime.")
+
+    st.markdown("""<style> .stTextInput>div>div>input { border: 2px solid #4CAF50; border-radius: 10px; padding: 10px; font-size: 16px; background-color: black; } </style>""", unsafe_allow_html=True)
+
+    # Filtro de período para a Tabela
+    if 'Data do Pedido' in df.columns:
+        secao_tabela(df)
+
+    secao_top_produtos(df)
+    secao_vendas_por_tempo(df)
+    secao_margem(df)
+
 
     
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+import json
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Compara o pico de memória (RSS) do caminho atual, response.json() + DataFrame,
+# com a leitura em streaming de decodificador.ler_json_colunar.
+# Uso (Linux): python bench_decodificador.py [linhas]
+
+
+# Gera uma resposta sintética no formato do endpoint /dados_vwsomelier
+def gerar_corpo(linhas):
+    partes = []
+    for i in range(linhas):
+        partes.append(json.dumps({
+            "DESCRICAO": f"PRODUTO {i % 5000}",
+            "CODPROD": i % 5000,
+            "DATA": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "QT": i % 17,
+            "PVENDA": round(i % 1000 * 1.37, 2),
+            "VLCUSTOFIN": round(i % 1000 * 0.91, 2),
+        }))
+    return ("[" + ",".join(partes) + "]").encode("utf-8")
+
+
+def servir(corpo):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+# Lê um campo de memória (em kB) de /proc/self/status
+def memoria_kb(campo):
+    with open("/proc/self/status") as f:
+        for linha in f:
+            if linha.startswith(campo + ":"):
+                return int(linha.split()[1])
+
+
+# Executado em um processo separado para que o pico de RSS seja de apenas um caminho
+def medir(caminho, url):
+    import pandas as pd
+    import requests
+    from decodificador import ler_json_colunar
+
+    base = memoria_kb("VmRSS")
+    if caminho == "atual":
+        response = requests.get(url)
+        df = pd.DataFrame(response.json())
+        df["DATA"] = pd.to_datetime(df["DATA"], errors="coerce")
+    else:
+        with requests.get(url, stream=True) as response:
+            df = ler_json_colunar(response, {"DATA": "datetime"})
+    pico = memoria_kb("VmHWM")
+    print(json.dumps({"linhas": len(df), "base_kb": base, "pico_kb": pico,
+                      "frame_kb": int(df.memory_usage(deep=True).sum() / 1024)}))
+
+
+def main():
+    linhas = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    corpo = gerar_corpo(linhas)
+    servidor = servir(corpo)
+    url = f"http://127.0.0.1:{servidor.server_port}/dados_vwsomelier"
+    print(f"Resposta sintética: {linhas} linhas, {len(corpo) / 2**20:.1f} MiB")
+
+    for caminho in ("atual", "streaming"):
+        saida = subprocess.run([sys.executable, __file__, "--medir", caminho, url],
+                               capture_output=True, text=True, check=True).stdout
+        r = json.loads(saida.strip().splitlines()[-1])
+        print(f"{caminho:>9}: pico {(r['pico_kb'] - r['base_kb']) / 1024:8.1f} MiB acima da base, "
+              f"DataFrame {r['frame_kb'] / 1024:8.1f} MiB")
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--medir":
+        medir(sys.argv[2], sys.argv[3])
+    else:
+        main()
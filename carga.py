@@ -0,0 +1,321 @@
+import argparse
+import json
+import os
+import random
+import requests
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Teste de carga: executa N sessões simultâneas de Cobata.main com o AppTest do Streamlit,
+# contra um stub local de /dados_pcpedc e /dados_vwsomelier com dados sintéticos.
+# Uso: python carga.py --niveis 1,2,4,8 --iteracoes 10 --linhas 200000
+#
+# Limitação: o AppTest.run() sempre reexecuta o script inteiro. Os filtros medidos (datas da
+# tabela do Produto, filiais da Página Inicial) ficam em st.fragment, e no navegador reexecutam
+# só a sua seção; as latências de "reruns" superestimam o custo dessas interações. Por isso
+# cada sessão também mede a seção isolada (colunas "frag"), executando só o corpo do fragmento
+# sobre os dados já carregados, o que se aproxima do rerun de fragmento de um usuário real.
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+USUARIO = "carga"
+SENHA = "carga"
+
+# Seção (fragmento) que contém o filtro alterado em cada página, e o conjunto de dados que recebe
+SECOES = {
+    "Produto": ("Produto", "secao_tabela", "vendas_produto"),
+    "Página Inicial": ("Página_Inicial", "secao_kpis", "pedidos"),
+}
+# DataFrames passados às seções medidas isoladamente (preenchido em main)
+QUADROS = {}
+
+
+# Gera as respostas sintéticas dos dois endpoints
+def gerar_respostas(linhas):
+    aleatorio = random.Random(42)
+    inicio = date(2023, 1, 1)
+    dias = (date.today() - inicio).days + 1
+    vendas, pedidos = [], []
+    for i in range(linhas):
+        data = (inicio + timedelta(days=aleatorio.randrange(dias))).isoformat()
+        preco = round(aleatorio.uniform(1, 500), 2)
+        vendas.append({
+            "DESCRICAO": f"PRODUTO {i % 5000}",
+            "CODPROD": i % 5000,
+            "DATA": data,
+            "QT": aleatorio.randint(1, 50),
+            "PVENDA": preco,
+            "VLCUSTOFIN": round(preco * aleatorio.uniform(0.5, 0.95), 2),
+        })
+        pedidos.append({
+            "DATA": data,
+            "VLTOTAL": preco,
+            "CODCLI": aleatorio.randrange(3000),
+            "NUMPED": i // 3,
+            "NOME": f"VENDEDOR {i % 40}",
+            "CODFILIAL": str(1 + i % 4),
+        })
+    return {
+        "/dados_vwsomelier": json.dumps(vendas).encode("utf-8"),
+        "/dados_pcpedc": json.dumps(pedidos).encode("utf-8"),
+    }
+
+
+# Servidor stub; conta quantos downloads cada endpoint recebeu e os expõe em /_downloads
+def servir(respostas):
+    downloads = {caminho: 0 for caminho in respostas}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            caminho = self.path.split("?")[0]
+            if caminho == "/_downloads":
+                with lock:
+                    corpo = json.dumps(downloads).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+                return
+            corpo = respostas.get(caminho)
+            if corpo is None:
+                self.send_error(404)
+                return
+            with lock:
+                downloads[caminho] += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    print(servidor.server_port, flush=True)
+    servidor.serve_forever()
+
+
+# Sobe o stub em um subprocesso, para que a memória medida seja apenas a do painel
+def iniciar_stub(linhas):
+    processo = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--stub", str(linhas)],
+                                stdout=subprocess.PIPE, text=True)
+    porta = int(processo.stdout.readline())
+    return processo, f"http://127.0.0.1:{porta}"
+
+
+def total_downloads(url_stub):
+    return sum(requests.get(f"{url_stub}/_downloads").json().values())
+
+
+# Lê um campo de memória (em kB) de /proc/self/status
+def memoria_kb(campo):
+    with open("/proc/self/status") as f:
+        for linha in f:
+            if linha.startswith(campo + ":"):
+                return int(linha.split()[1])
+
+
+# O AppTest substitui e zera Runtime._instance a cada execução, o que quebraria as outras
+# sessões em andamento. Aqui todas compartilham um único runtime simulado, como em um servidor real.
+def preparar_runtime():
+    from unittest.mock import MagicMock
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.testing.v1 import app_test
+
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime._instance = runtime
+    app_test.Runtime = type("RuntimeIsolado", (Runtime,), {})
+
+
+# Conta as chamadas ao cache de dados (requisições das páginas)
+def contar_chamadas_cache(dados):
+    contador = {"chamadas": 0}
+    lock = threading.Lock()
+    original = dados._carregar_cache
+
+    def contado(*args, **kwargs):
+        with lock:
+            contador["chamadas"] += 1
+        return original(*args, **kwargs)
+
+    contado.clear = original.clear
+    dados._carregar_cache = contado
+    return contador
+
+
+class Sessao:
+    def __init__(self, script, paginas, iteracoes, semente, timeout):
+        from streamlit.testing.v1 import AppTest
+        self.at = AppTest.from_string(script, default_timeout=timeout)
+        # Um AppTest por seção, que executa apenas o corpo da função do fragmento. O corpo é chamado
+        # sem o st.fragment (__wrapped__): vários fragmentos na raiz de scripts simultâneos do AppTest
+        # misturam os widgets entre sessões, e o registro do fragmento não altera o custo medido.
+        self.fragmentos = {
+            pagina: AppTest.from_string(f"import carga\n"
+                                        f"import importlib\n"
+                                        f"pagina = importlib.import_module({modulo!r})\n"
+                                        f"pagina.{secao}.__wrapped__(carga.QUADROS[{nome!r}])\n",
+                                        default_timeout=timeout)
+            for pagina, (modulo, secao, nome) in SECOES.items() if pagina in paginas
+        }
+        self.paginas = paginas
+        self.iteracoes = iteracoes
+        self.aleatorio = random.Random(semente)
+        self.latencias = []
+        self.latencias_fragmento = []
+        self.erros = []
+
+    def _rerun(self, acao, latencias=None, at=None):
+        if at is None:
+            at = self.at
+        inicio = time.perf_counter()
+        try:
+            acao()
+        except Exception as e:
+            self.erros.append(repr(e))
+        else:
+            self.erros.extend(e.value for e in at.exception)
+        (self.latencias if latencias is None else latencias).append(time.perf_counter() - inicio)
+
+    def _widget(self, at, tipo, label):
+        for widget in getattr(at, tipo):
+            if widget.label == label:
+                return widget
+
+    # Devolve a ação que altera o filtro da página em `at` (ou None se o filtro não estiver na tela)
+    def _filtro(self, at, pagina, sorteio):
+        if pagina == "Produto":
+            widget = self._widget(at, "date_input", "Data de Início - Tabela")
+            if widget is not None:
+                valor = date(2023, 1, 1) + timedelta(days=sorteio % 600)
+                return lambda: widget.set_value(valor).run()
+        elif pagina == "Página Inicial":
+            filiais = [c for c in at.checkbox if c.label.startswith("Filial:")]
+            if filiais:
+                filial = filiais[sorteio % len(filiais)]
+                return lambda: filial.set_value(not filial.value).run()
+
+    # A mesma troca de filtro é medida no app inteiro e na seção isolada
+    def _mudar_filtro(self, pagina):
+        sorteio = self.aleatorio.randrange(1 << 30)
+        acao = self._filtro(self.at, pagina, sorteio)
+        if acao is not None:
+            self._rerun(acao)
+        fragmento = self.fragmentos.get(pagina)
+        if fragmento is not None:
+            acao = self._filtro(fragmento, pagina, sorteio)
+            if acao is not None:
+                self._rerun(acao, self.latencias_fragmento, fragmento)
+
+    def executar(self):
+        # Falhas fora de um rerun (ex.: tela de login ausente) encerram a sessão, mas ficam registradas
+        try:
+            self._executar()
+        except Exception as e:
+            self.erros.append(repr(e))
+
+    def _executar(self):
+        self._rerun(self.at.run)
+        self.at.text_input[0].input(USUARIO)
+        self.at.text_input[1].input(SENHA)
+        self._rerun(lambda: self._widget(self.at, "button", "Entrar").click().run())
+        self._rerun(self.at.run)
+        # Primeira execução das seções isoladas (não entra nas latências)
+        for fragmento in self.fragmentos.values():
+            self._rerun(fragmento.run, [], fragmento)
+
+        for _ in range(self.iteracoes):
+            pagina = self.aleatorio.choice(self.paginas)
+            self._rerun(lambda: self.at.sidebar.button(key=pagina).click().run())
+            self._mudar_filtro(pagina)
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    if not ordenados:
+        return float("nan")
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga de sessões simultâneas do painel.")
+    parser.add_argument("--niveis", default="1,2,4,8", help="níveis de concorrência, separados por vírgula")
+    parser.add_argument("--iteracoes", type=int, default=10, help="trocas de página por sessão")
+    parser.add_argument("--linhas", type=int, default=100000, help="linhas sintéticas por endpoint")
+    parser.add_argument("--paginas", default="Página Inicial,Produto", help="páginas visitadas")
+    parser.add_argument("--timeout", type=float, default=120, help="timeout de cada rerun (s)")
+    args = parser.parse_args()
+
+    os.chdir(DIRETORIO)
+    sys.path.insert(0, DIRETORIO)
+    import dados
+
+    stub, dados.BASE_URL = iniciar_stub(args.linhas)
+    preparar_runtime()
+    # As seções isoladas importam este módulo como "carga" para ler QUADROS
+    sys.modules.setdefault("carga", sys.modules[__name__])
+    paginas = [p.strip() for p in args.paginas.split(",")]
+    for pagina, (_, _, nome) in SECOES.items():
+        if pagina in paginas and nome not in QUADROS:
+            QUADROS[nome] = dados._buscar(nome, dados.DATA_INICIAL, dados.DATA_FINAL)
+    chamadas = contar_chamadas_cache(dados)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({USUARIO: {"password": SENHA}}, f)
+        arquivo_usuarios = f.name
+    script = (f"import Cobata\n"
+              f"Cobata.USER_DATA_FILE = {arquivo_usuarios!r}\n"
+              f"Cobata.main()\n")
+
+    print("Obs.: 'reruns' reexecutam o app inteiro (AppTest); trocas de filtro dentro de st.fragment\n"
+          "      reexecutam só a seção no navegador, medida isoladamente em 'frag p50'/'frag p90'.")
+    print(f"{'sessões':>7} {'reruns':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'máx ms':>8} "
+          f"{'frag p50':>8} {'frag p90':>8} "
+          f"{'RSS MiB':>8} {'pico MiB':>8} {'cache':>6} {'downl.':>6} {'acerto':>6} {'erros':>5}")
+    try:
+        for nivel in [int(n) for n in args.niveis.split(",")]:
+            # Cada nível começa com o cache frio
+            dados._carregar_cache.clear()
+            chamadas["chamadas"] = 0
+            downloads_antes = total_downloads(dados.BASE_URL)
+
+            sessoes = [Sessao(script, paginas, args.iteracoes, i, args.timeout) for i in range(nivel)]
+            threads = [threading.Thread(target=s.executar) for s in sessoes]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            latencias = [l * 1000 for s in sessoes for l in s.latencias]
+            latencias_fragmento = [l * 1000 for s in sessoes for l in s.latencias_fragmento]
+            erros = [e for s in sessoes for e in s.erros]
+            downloads = total_downloads(dados.BASE_URL) - downloads_antes
+            acerto = 1 - downloads / chamadas["chamadas"] if chamadas["chamadas"] else float("nan")
+            print(f"{nivel:>7} {len(latencias):>6} {percentil(latencias, 50):>8.0f} "
+                  f"{percentil(latencias, 90):>8.0f} {percentil(latencias, 99):>8.0f} {percentil(latencias, 100):>8.0f} "
+                  f"{percentil(latencias_fragmento, 50):>8.0f} {percentil(latencias_fragmento, 90):>8.0f} "
+                  f"{memoria_kb('VmRSS') / 1024:>8.0f} {memoria_kb('VmHWM') / 1024:>8.0f} "
+                  f"{chamadas['chamadas']:>6} {downloads:>6} {acerto:>6.0%} {len(erros):>5}")
+            for erro in sorted(set(erros))[:5]:
+                print(f"        erro: {erro[:200]}")
+    finally:
+        stub.terminate()
+        os.remove(arquivo_usuarios)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--stub":
+        servir(gerar_respostas(int(sys.argv[2])))
+    else:
+        main()
@@ -0,0 +1,149 @@
+import streamlit as st
+import pandas as pd
+import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from decodificador import ler_json_colunar
+
+# Endereço base dos endpoints e período padrão carregado pelas páginas
+BASE_URL = "http://127.0.0.1:5000"
+DATA_INICIAL = "2023-01-01"
+DATA_FINAL = "2025-12-31"
+# Tempo máximo de conexão e de espera entre blocos da resposta (s)
+TIMEOUT = (10, 120)
+# Por quanto tempo uma falha de carga fica em cache, compartilhada pelas sessões (s)
+TTL_FALHA = 30
+
+
+# Declaração de um conjunto de dados: origem, esquema, tipos e colunas derivadas
+@dataclass(frozen=True)
+class Dataset:
+    endpoint: str
+    colunas: tuple
+    tipos: dict = field(default_factory=dict)
+    derivadas: tuple = ()
+    limite: int = 5000000
+
+
+# Falha de carga guardada no cache no lugar do DataFrame
+@dataclass(frozen=True)
+class Falha:
+    mensagem: str
+    momento: float
+
+
+# Registro central dos conjuntos de dados usados pelas páginas.
+# Estoque, Validade e Fornecedor devem declarar aqui os seus quando os endpoints existirem.
+DATASETS = {
+    "vendas_produto": Dataset(
+        endpoint="dados_vwsomelier",
+        colunas=("DESCRICAO", "CODPROD", "DATA", "QT", "PVENDA", "VLCUSTOFIN"),
+        tipos={"DESCRICAO": "str", "CODPROD": "str", "DATA": "datetime"},
+        derivadas=(
+            ("CÓDIGO PRODUTO", lambda df: df["CODPROD"]),
+            ("Data do Pedido", lambda df: df["DATA"]),
+            ("VALOR TOTAL VENDIDO", lambda df: df["PVENDA"]),
+            ("Margem de Lucro", lambda df: df["PVENDA"] - df["VLCUSTOFIN"]),
+            ("Ano", lambda df: df["DATA"].dt.year),
+            ("Mês", lambda df: df["DATA"].dt.month),
+        ),
+        limite=50000000,
+    ),
+    "pedidos": Dataset(
+        endpoint="dados_pcpedc",
+        colunas=("DATA", "VLTOTAL", "CODCLI", "NUMPED", "NOME", "CODFILIAL"),
+        tipos={"DATA": "datetime"},
+    ),
+}
+
+
+# Baixa o conjunto de dados do endpoint (os tipos são aplicados na decodificação)
+# e valida o esquema e calcula as colunas derivadas
+def _buscar(nome, data_inicial, data_final):
+    dataset = DATASETS[nome]
+    params = {
+        'data_inicial': data_inicial,
+        'data_final': data_final,
+        'pagina': 1,
+        'limite': dataset.limite
+    }
+    with requests.get(f"{BASE_URL}/{dataset.endpoint}", params=params, stream=True,
+                      timeout=TIMEOUT) as response:
+        response.raise_for_status()
+        df = ler_json_colunar(response, dataset.tipos)
+    df = df.rename(columns=lambda coluna: str(coluna).strip())
+
+    missing_columns = [col for col in dataset.colunas if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"As seguintes colunas estão faltando: {', '.join(missing_columns)}")
+
+    for coluna, derivar in dataset.derivadas:
+        df[coluna] = derivar(df)
+    # Identifica esta carga, para caches derivados expirarem junto com o dataset
+    df.attrs['versao'] = time.time_ns()
+    return df
+
+
+# Mensagem exibida na página para um erro de carga
+def _mensagem_erro(nome, erro):
+    if isinstance(erro, requests.exceptions.RequestException):
+        return f"Erro ao buscar dados de '{nome}': {erro}"
+    return str(erro)
+
+
+# Cache por processo. O st.cache_data calcula cada chave sob um lock próprio, então
+# sessões simultâneas após a expiração esperam e compartilham um único download.
+# Exceções não ficam em cache: a falha é devolvida como Falha, para que as sessões
+# que esperavam o lock a recebam em vez de repetir a requisição.
+@st.cache_data(ttl=300, show_spinner=False)
+def _carregar_cache(nome, data_inicial, data_final):
+    try:
+        return _buscar(nome, data_inicial, data_final)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return Falha(_mensagem_erro(nome, e), time.time())
+
+
+_lock_falhas = threading.Lock()
+
+
+# Devolve o conjunto em cache; uma falha mais antiga que TTL_FALHA é descartada
+# (por uma única sessão) e a carga é tentada de novo
+def _carregar(nome, data_inicial, data_final):
+    resultado = _carregar_cache(nome, data_inicial, data_final)
+    if isinstance(resultado, Falha) and time.time() - resultado.momento > TTL_FALHA:
+        with _lock_falhas:
+            atual = _carregar_cache(nome, data_inicial, data_final)
+            if isinstance(atual, Falha) and atual.momento == resultado.momento:
+                _carregar_cache.clear(nome, data_inicial, data_final)
+        resultado = _carregar_cache(nome, data_inicial, data_final)
+    return resultado
+
+
+# Exibe o erro de carga na página e devolve um DataFrame vazio
+def _tratar_falha(resultado):
+    if isinstance(resultado, Falha):
+        st.error(resultado.mensagem)
+        return pd.DataFrame()
+    return resultado
+
+
+# Função para carregar um conjunto de dados do registro
+def carregar_dataset(nome, data_inicial=DATA_INICIAL, data_final=DATA_FINAL):
+    return _tratar_falha(_carregar(nome, data_inicial, data_final))
+
+
+# Função para carregar vários conjuntos de dados em paralelo
+def carregar_datasets(*nomes, data_inicial=DATA_INICIAL, data_final=DATA_FINAL):
+    ctx = get_script_run_ctx()
+
+    def carregar(nome):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return _carregar(nome, data_inicial, data_final)
+
+    with ThreadPoolExecutor(max_workers=len(nomes) or 1) as executor:
+        futuros = {nome: executor.submit(carregar, nome) for nome in nomes}
+
+    return {nome: _tratar_falha(futuro.result()) for nome, futuro in futuros.items()}
@@ -0,0 +1,182 @@
+import codecs
+import json
+import numpy as np
+import pandas as pd
+
+# Quantidade de registros convertidos de uma vez para os buffers de coluna
+TAMANHO_LOTE = 50000
+TAMANHO_BLOCO = 1 << 20
+
+_decoder = json.JSONDecoder()
+_ESPACOS = " \t\r\n"
+
+
+# Buffer tipado de uma coluna, preenchido lote a lote
+class _Coluna:
+    def __init__(self, dtype, capacidade):
+        self.dados = np.empty(capacidade, dtype=dtype)
+        self.n = 0
+
+    def reservar(self, capacidade):
+        if capacidade > len(self.dados):
+            novo = np.empty(capacidade, dtype=self.dados.dtype)
+            novo[:self.n] = self.dados[:self.n]
+            self.dados = novo
+
+    def estender(self, valores):
+        if valores.dtype != self.dados.dtype:
+            self._promover(valores.dtype)
+        fim = self.n + len(valores)
+        if fim > len(self.dados):
+            self.reservar(max(fim, 2 * len(self.dados)))
+        self.dados[self.n:fim] = valores
+        self.n = fim
+
+    def _promover(self, dtype):
+        atual = self.dados.dtype
+        if atual.kind in "biuf" and dtype.kind in "biuf":
+            destino = np.result_type(atual, dtype)
+        else:
+            destino = np.dtype(object)
+        if destino != atual:
+            self.dados = self.dados.astype(destino)
+
+    def valores(self):
+        return self.dados[:self.n]
+
+
+# Converte os valores de um lote de acordo com o tipo declarado (ou inferido).
+# Este é o único ponto onde os tipos declarados no registro são aplicados.
+def _converter_lote(valores, tipo):
+    if tipo == "datetime":
+        return pd.to_datetime(pd.Series(valores, dtype=object), errors="coerce").to_numpy()
+    if tipo == "float":
+        return pd.to_numeric(pd.Series(valores, dtype=object), errors="coerce").to_numpy(dtype=float)
+    if tipo == "str":
+        return np.array(["" if valor is None else str(valor).strip() for valor in valores], dtype=object)
+    if all(valor is None for valor in valores):
+        # Lote só com nulos: float (NaN) é compatível com qualquer tipo numérico dos outros lotes
+        return np.full(len(valores), np.nan)
+    return pd.Series(valores).to_numpy()
+
+
+# Aplica os tipos declarados a um DataFrame já montado (resposta fora do formato de lista)
+def _aplicar_tipos(df, tipos):
+    for coluna in df.columns:
+        tipo = tipos.get(str(coluna).strip())
+        if tipo is not None:
+            df[coluna] = _converter_lote(df[coluna].astype(object).where(df[coluna].notna(), None).tolist(), tipo)
+    return df
+
+
+class _Montador:
+    def __init__(self, tipos, capacidade_inicial):
+        self.tipos = tipos
+        self.capacidade = capacidade_inicial
+        self.colunas = {}
+        self.linhas = 0
+
+    def adicionar_lote(self, lote):
+        nomes = list(self.colunas)
+        for registro in lote:
+            for nome in registro:
+                if nome not in self.colunas and nome not in nomes:
+                    nomes.append(nome)
+
+        for nome in nomes:
+            tipo = self.tipos.get(str(nome).strip())
+            valores = _converter_lote([registro.get(nome) for registro in lote], tipo)
+            coluna = self.colunas.get(nome)
+            if coluna is None:
+                coluna = _Coluna(valores.dtype, self.capacidade)
+                if self.linhas:
+                    # Colunas que aparecem depois do primeiro lote são completadas com o nulo
+                    # do tipo declarado (NaT, "" ou NaN)
+                    coluna.estender(_converter_lote([None] * self.linhas, tipo))
+                self.colunas[nome] = coluna
+            coluna.estender(valores)
+        self.linhas += len(lote)
+
+    def reservar(self, capacidade):
+        self.capacidade = capacidade
+        for coluna in self.colunas.values():
+            coluna.reservar(capacidade)
+
+    def dataframe(self):
+        # Colunas promovidas a object por causa de nulos voltam ao tipo que pandas inferiria
+        return pd.DataFrame({nome: coluna.valores() for nome, coluna in self.colunas.items()}).infer_objects()
+
+
+# Função para ler uma resposta JSON (lista de registros) direto em colunas tipadas,
+# sem materializar o texto completo nem a lista de dicionários
+def ler_json_colunar(response, tipos=None, tamanho_lote=TAMANHO_LOTE):
+    tipos = tipos or {}
+    total_bytes = int(response.headers.get("Content-Length") or 0)
+    decodificador = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+    blocos = response.iter_content(chunk_size=TAMANHO_BLOCO)
+
+    montador = _Montador(tipos, tamanho_lote)
+    lote = []
+    texto = ""
+    pos = 0
+    lidos = 0
+    inicio = True
+    fim_stream = False
+
+    while True:
+        # Consome todos os registros completos disponíveis no buffer
+        while True:
+            while pos < len(texto) and texto[pos] in _ESPACOS:
+                pos += 1
+            if pos >= len(texto):
+                break
+
+            if inicio:
+                if texto[pos] != "[":
+                    # Resposta não é uma lista de registros: usa o caminho tradicional
+                    restante = texto[pos:] + "".join(decodificador.decode(b) for b in blocos)
+                    restante += decodificador.decode(b"", final=True)
+                    return _aplicar_tipos(pd.DataFrame(json.loads(restante)), tipos)
+                inicio = False
+                pos += 1
+                continue
+
+            if texto[pos] == ",":
+                pos += 1
+                continue
+            if texto[pos] == "]":
+                if lote:
+                    montador.adicionar_lote(lote)
+                return montador.dataframe()
+
+            try:
+                registro, pos = _decoder.raw_decode(texto, pos)
+            except json.JSONDecodeError:
+                if fim_stream:
+                    raise
+                break
+            if not isinstance(registro, dict):
+                raise ValueError("A resposta do endpoint não é uma lista de registros.")
+            lote.append(registro)
+
+            if len(lote) >= tamanho_lote:
+                primeiro_lote = montador.linhas == 0
+                montador.adicionar_lote(lote)
+                lote = []
+                if primeiro_lote and total_bytes:
+                    # Estima o total de linhas pelo tamanho da resposta e reserva os buffers uma vez
+                    bytes_por_linha = (lidos - (len(texto) - pos)) / montador.linhas
+                    montador.reservar(int(total_bytes / bytes_por_linha * 1.05))
+
+        if fim_stream:
+            raise ValueError("A resposta do endpoint terminou antes do fim da lista de registros.")
+
+        bloco = next(blocos, None)
+        texto = texto[pos:]
+        pos = 0
+        if bloco is None:
+            fim_stream = True
+            texto += decodificador.decode(b"", final=True)
+        else:
+            lidos += len(bloco)
+            texto += decodificador.decode(bloco)
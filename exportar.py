@@ -0,0 +1,174 @@
+import streamlit as st
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xlsxwriter
+import os
+import tempfile
+import time
+
+# Linhas convertidas por vez; nenhuma etapa monta o arquivo inteiro como texto
+TAMANHO_BLOCO = 100000
+# Limite de linhas de uma planilha do Excel (incluindo o cabeçalho)
+LINHAS_POR_PLANILHA = 1048576
+# Diretório dos arquivos gerados e idade (s) a partir da qual um arquivo não baixado é removido,
+# cobrindo sessões encerradas sem baixar o arquivo
+DIRETORIO_EXPORTACAO = os.path.join(tempfile.gettempdir(), "cobata_exportacoes")
+TTL_ARQUIVO = 3600
+
+FORMATOS = {
+    "CSV": ("csv", "text/csv"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def _blocos(df, tamanho_bloco):
+    for inicio in range(0, len(df), tamanho_bloco):
+        yield df.iloc[inicio:inicio + tamanho_bloco]
+
+
+# Função para gerar CSV bloco a bloco
+def gerar_csv(df, saida, tamanho_bloco=TAMANHO_BLOCO):
+    saida.write(df.iloc[:0].to_csv(index=False).encode("utf-8-sig"))
+    for bloco in _blocos(df, tamanho_bloco):
+        saida.write(bloco.to_csv(index=False, header=False).encode("utf-8"))
+
+
+# Função para gerar Parquet com um row group por bloco
+def gerar_parquet(df, saida, tamanho_bloco=TAMANHO_BLOCO):
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(saida, schema) as writer:
+        for bloco in _blocos(df, tamanho_bloco):
+            writer.write_table(pa.Table.from_pandas(bloco, schema=schema, preserve_index=False))
+
+
+# Função para gerar Excel em modo de memória constante, abrindo novas planilhas ao atingir o limite de linhas
+def gerar_excel(df, saida, tamanho_bloco=TAMANHO_BLOCO):
+    workbook = xlsxwriter.Workbook(saida, {"constant_memory": True, "in_memory": False})
+    formato_data = workbook.add_format({"num_format": "dd/mm/yyyy"})
+    cabecalho = [str(coluna) for coluna in df.columns]
+    colunas_data = [i for i, coluna in enumerate(df.columns)
+                    if pd.api.types.is_datetime64_any_dtype(df[coluna])]
+
+    planilha = None
+    linha = LINHAS_POR_PLANILHA
+    for bloco in _blocos(df, tamanho_bloco):
+        valores = bloco.astype(object).where(bloco.notna(), None)
+        for registro in valores.itertuples(index=False, name=None):
+            if linha >= LINHAS_POR_PLANILHA:
+                planilha = workbook.add_worksheet()
+                planilha.write_row(0, 0, cabecalho)
+                for i in colunas_data:
+                    planilha.set_column(i, i, 12, formato_data)
+                linha = 1
+            planilha.write_row(linha, 0, registro)
+            linha += 1
+
+    if planilha is None:
+        workbook.add_worksheet().write_row(0, 0, cabecalho)
+    workbook.close()
+
+
+GERADORES = {
+    "CSV": gerar_csv,
+    "Excel": gerar_excel,
+    "Parquet": gerar_parquet,
+}
+
+
+# Função para exportar um DataFrame no formato escolhido para um arquivo temporário;
+# devolve o caminho do arquivo, para que o conteúdo não fique em memória na sessão
+def exportar(df, formato):
+    extensao, _ = FORMATOS[formato]
+    os.makedirs(DIRETORIO_EXPORTACAO, exist_ok=True)
+    with tempfile.NamedTemporaryFile(suffix=f".{extensao}", dir=DIRETORIO_EXPORTACAO, delete=False) as saida:
+        try:
+            GERADORES[formato](df, saida)
+        except Exception:
+            # Não deixa para trás um arquivo gerado pela metade
+            saida.close()
+            os.remove(saida.name)
+            raise
+    return saida.name
+
+
+# Remove os arquivos gerados há mais de TTL_ARQUIVO segundos
+def limpar_arquivos_antigos():
+    limite = time.time() - TTL_ARQUIVO
+    try:
+        entradas = list(os.scandir(DIRETORIO_EXPORTACAO))
+    except FileNotFoundError:
+        return
+    for entrada in entradas:
+        try:
+            if entrada.is_file() and entrada.stat().st_mtime < limite:
+                os.remove(entrada.path)
+        except FileNotFoundError:
+            # Já removido por outra sessão
+            pass
+
+
+# Remove o arquivo gerado e a entrada da sessão
+def descartar_arquivo(chave_arquivo):
+    arquivo = st.session_state.pop(chave_arquivo, None)
+    if arquivo is not None and os.path.exists(arquivo["caminho"]):
+        os.remove(arquivo["caminho"])
+
+
+# Função para exibir os botões de exportação de uma tabela.
+# `conjuntos` mapeia o nome do conteúdo (ex.: resumo, linhas filtradas) ao DataFrame numérico,
+# ou a uma função que o calcula apenas quando o arquivo for gerado;
+# o arquivo só é gerado sob demanda e é descartado quando `assinatura` (os filtros) muda,
+# depois de baixado ou, se nunca for baixado, após TTL_ARQUIVO segundos.
+def exibir_exportacao(conjuntos, nome_arquivo, chave, assinatura):
+    limpar_arquivos_antigos()
+    chave_arquivo = f"{chave}_arquivo"
+    arquivo = st.session_state.get(chave_arquivo)
+    if arquivo is not None and arquivo["assinatura"] != assinatura:
+        descartar_arquivo(chave_arquivo)
+        arquivo = None
+
+    col_conteudo, col_formato, col_gerar, col_baixar = st.columns(4)
+    with col_conteudo:
+        conteudo = st.selectbox("Conteúdo", list(conjuntos), key=f"{chave}_conteudo")
+    with col_formato:
+        formato = st.selectbox("Formato", list(FORMATOS), key=f"{chave}_formato")
+    with col_gerar:
+        if st.button("📤 Gerar arquivo", key=f"{chave}_gerar"):
+            with st.spinner("Gerando arquivo..."):
+                df = conjuntos[conteudo]
+                if callable(df):
+                    df = df()
+                descartar_arquivo(chave_arquivo)
+                arquivo = None
+                try:
+                    arquivo = {
+                        "assinatura": assinatura,
+                        "conteudo": conteudo,
+                        "formato": formato,
+                        "caminho": exportar(df, formato),
+                    }
+                except Exception as e:
+                    st.error(f"Erro ao gerar o arquivo {formato}: {e}")
+            if arquivo is not None:
+                st.session_state[chave_arquivo] = arquivo
+    with col_baixar:
+        if arquivo is not None:
+            extensao, mime = FORMATOS[arquivo["formato"]]
+            try:
+                dados = open(arquivo["caminho"], "rb")
+            except FileNotFoundError:
+                # Arquivo já removido (ex.: pela limpeza dos antigos): descarta a entrada da sessão
+                st.session_state.pop(chave_arquivo, None)
+            else:
+                with dados:
+                    st.download_button(
+                        f"⬇️ Baixar {arquivo['conteudo']} ({arquivo['formato']})",
+                        dados,
+                        file_name=f"{nome_arquivo}_{arquivo['conteudo'].lower().replace(' ', '_')}.{extensao}",
+                        mime=mime,
+                        key=f"{chave}_baixar",
+                        on_click=descartar_arquivo,
+                        args=(chave_arquivo,),
+                    )
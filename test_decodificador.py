@@ -0,0 +1,64 @@
+import json
+
+import pandas as pd
+
+from decodificador import ler_json_colunar
+
+
+# Resposta mínima com a interface usada por ler_json_colunar
+class RespostaFalsa:
+    def __init__(self, registros):
+        self.corpo = json.dumps(registros).encode("utf-8")
+        self.headers = {"Content-Length": str(len(self.corpo))}
+        self.encoding = "utf-8"
+
+    def iter_content(self, chunk_size):
+        for inicio in range(0, len(self.corpo), chunk_size):
+            yield self.corpo[inicio:inicio + chunk_size]
+
+
+def test_coluna_tardia_usa_o_nulo_do_tipo_declarado():
+    registros = [{"x": 1}, {"x": 2}, {"x": 3},
+                 {"x": 1, "DATA": "2024-01-02", "DESCRICAO": " PRODUTO ", "VALOR": "1.5"}]
+    df = ler_json_colunar(RespostaFalsa(registros),
+                          {"DATA": "datetime", "DESCRICAO": "str", "VALOR": "float"},
+                          tamanho_lote=3)
+
+    assert pd.api.types.is_datetime64_any_dtype(df["DATA"])
+    assert df["DATA"].isna().tolist() == [True, True, True, False]
+    assert df["DATA"].iloc[3] == pd.Timestamp("2024-01-02")
+    assert df["DESCRICAO"].tolist() == ["", "", "", "PRODUTO"]
+    assert df["VALOR"].dtype == float
+    assert df["VALOR"].iloc[3] == 1.5
+
+
+def test_coluna_tardia_sem_tipo_declarado_vira_float():
+    registros = [{"x": 1}, {"x": 2}, {"x": 3, "QT": 4}]
+    df = ler_json_colunar(RespostaFalsa(registros), tamanho_lote=2)
+
+    assert df["QT"].dtype == float
+    assert df["QT"].isna().tolist() == [True, True, False]
+
+
+def test_lote_so_com_nulos_mantem_o_tipo_numerico():
+    registros = [{"QT": None}, {"QT": None}, {"QT": 1.5}, {"QT": 2}]
+    df = ler_json_colunar(RespostaFalsa(registros), tamanho_lote=2)
+
+    assert df["QT"].dtype == float
+    assert df["QT"].tolist()[2:] == [1.5, 2.0]
+
+
+def test_lote_so_com_nulos_seguido_de_inteiros():
+    registros = [{"QT": 1}, {"QT": 2}, {"QT": None}, {"QT": None}, {"QT": 3}, {"QT": 4}]
+    df = ler_json_colunar(RespostaFalsa(registros), tamanho_lote=2)
+
+    assert df["QT"].dtype == float
+    assert df["QT"].isna().tolist() == [False, False, True, True, False, False]
+
+
+def test_lote_so_com_nulos_em_coluna_de_data():
+    registros = [{"DATA": None}, {"DATA": None}, {"DATA": "2024-03-01"}]
+    df = ler_json_colunar(RespostaFalsa(registros), {"DATA": "datetime"}, tamanho_lote=2)
+
+    assert pd.api.types.is_datetime64_any_dtype(df["DATA"])
+    assert df["DATA"].iloc[2] == pd.Timestamp("2024-03-01")